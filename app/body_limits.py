@@ -0,0 +1,131 @@
+import json
+import zlib
+from typing import Dict, Optional
+
+# Tells zlib to expect a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+CHUNK_SIZE = 64 * 1024
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class BodyLimitMiddleware:
+    """
+    ASGI middleware that reads request bodies under a byte limit before the app sees them
+
+    Oversized bodies are rejected with 413 from the Content-Length header when
+    present, otherwise as soon as the streamed bytes pass the limit, so nothing
+    over the limit is ever buffered or handed to JSON parsing. gzip-encoded
+    bodies are inflated incrementally and the limit applies to the inflated size.
+    path_limits overrides the limit for specific paths.
+    """
+
+    def __init__(self, app, max_body_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope["path"], self.max_body_bytes)
+        headers = dict(scope["headers"])
+        encoding = headers.get(b"content-encoding", b"identity").decode("latin-1").strip().lower()
+        if encoding not in ("identity", "gzip"):
+            await self._reject(send, 415, f"Unsupported Content-Encoding: {encoding}")
+            return
+
+        content_length = headers.get(b"content-length", b"0")
+        if not content_length.isdigit():
+            await self._reject(send, 400, "Invalid Content-Length header")
+            return
+        if int(content_length) > limit:
+            await self._reject(send, 413, f"Request body too large (max {limit} bytes)")
+            return
+
+        try:
+            body = await self._read_body(receive, limit, gzipped=encoding == "gzip")
+        except BodyTooLarge:
+            await self._reject(send, 413, f"Request body too large (max {limit} bytes)")
+            return
+        except zlib.error:
+            await self._reject(send, 400, "Invalid gzip request body")
+            return
+        except ClientDisconnected:
+            # Nobody is left to answer, and a partial body must not reach the app
+            return
+
+        # Downstream sees a plain, fully-read body with an accurate length
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value) for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    async def _read_body(self, receive, limit: int, gzipped: bool) -> bytes:
+        decompressor = zlib.decompressobj(GZIP_WBITS) if gzipped else None
+        chunks = []
+        size = 0
+
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise ClientDisconnected()
+            chunk = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if decompressor is not None:
+                # Inflate in bounded steps so a small gzip bomb cannot expand past the limit
+                pending = chunk
+                while pending:
+                    chunk = decompressor.decompress(pending, CHUNK_SIZE)
+                    pending = decompressor.unconsumed_tail
+                    size = self._append(chunks, chunk, size, limit)
+            else:
+                size = self._append(chunks, chunk, size, limit)
+
+        if decompressor is not None:
+            self._append(chunks, decompressor.flush(), size, limit)
+            if not decompressor.eof:
+                raise zlib.error("gzip body ended before its trailer")
+        return b"".join(chunks)
+
+    def _append(self, chunks: list, chunk: bytes, size: int, limit: int) -> int:
+        size += len(chunk)
+        if size > limit:
+            raise BodyTooLarge()
+        chunks.append(chunk)
+        return size
+
+    async def _reject(self, send, status_code: int, detail: str):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,241 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from schemas import ArticleRequest, BatchEvaluationItem, EvaluationResponse
+
+RETRY_STATUS_CODES = {429, 503}
+
+
+class EvaluatorAPIError(Exception):
+    """Raised when the API rejects an evaluation, e.g. article too short or too long"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class EvaluatorClient:
+    """
+    Async client for the evaluator API
+
+    One pooled httpx client is shared by every call. Concurrent evaluate()
+    calls are grouped into /evaluate/batch requests, sent once batch_size
+    articles are waiting or batch_window seconds have passed. 503s, 429s and
+    timeouts are retried with backoff, respecting Retry-After, and only the
+    articles that have not been answered yet are sent again. At most
+    max_connections batches are in flight at once, the rest wait their turn.
+
+        async with EvaluatorClient() as client:
+            result = await client.evaluate(article_text, title="Climate Change")
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        batch_size: int = 20,
+        batch_window: float = 0.01,
+        max_retries: int = 3,
+        max_backoff: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff
+
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport
+        )
+        self._pending: List[Tuple[ArticleRequest, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._batches = set()
+        self._batch_slots = asyncio.Semaphore(max_connections)
+
+    async def __aenter__(self) -> "EvaluatorClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Send anything still queued, then close the connection pool"""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        await self._client.aclose()
+
+    async def health(self) -> dict:
+        response = await self._client.get("/health")
+        response.raise_for_status()
+        return response.json()
+
+    async def evaluate(self, article_text: str, title: Optional[str] = None) -> EvaluationResponse:
+        """Evaluate one article, batched together with other calls made around the same time"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((ArticleRequest(article_text=article_text, title=title), future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+        return await future
+
+    async def evaluate_many(
+        self, articles: Iterable[ArticleRequest]
+    ) -> AsyncIterator[Tuple[int, EvaluationResponse]]:
+        """
+        Stream (index, result) pairs as evaluations complete, in completion order
+
+        Raises EvaluatorAPIError for the first article the API rejects.
+        """
+        articles = list(articles)
+        batches = [
+            self._stream_batch(articles[start:start + self.batch_size], offset=start)
+            for start in range(0, len(articles), self.batch_size)
+        ]
+        queue = asyncio.Queue()
+
+        async def drain(batch):
+            try:
+                async for item in batch:
+                    await queue.put(item)
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(drain(batch)) for batch in batches]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await queue.get()
+                if item is None:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item.index, self._unwrap(item)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _flush(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        task = asyncio.get_running_loop().create_task(self._send_batch(pending))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+        if self._pending:
+            self._flush()
+
+    async def _send_batch(self, pending: List[Tuple[ArticleRequest, asyncio.Future]]):
+        futures = [future for _, future in pending]
+        try:
+            async for item in self._stream_batch([article for article, _ in pending]):
+                future = futures[item.index]
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self._unwrap(item))
+                except EvaluatorAPIError as e:
+                    future.set_exception(e)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _stream_batch(
+        self, articles: List[ArticleRequest], offset: int = 0
+    ) -> AsyncIterator[BatchEvaluationItem]:
+        """Post one batch and yield items as they stream in, retrying whatever is unanswered"""
+
+        remaining: Dict[int, ArticleRequest] = dict(enumerate(articles))
+        attempt = 0
+
+        while remaining:
+            # Evaluations are pure, so resending the unanswered articles is safe
+            indices = list(remaining)
+            payload = {"articles": [remaining[i].model_dump() for i in indices]}
+            retry_after = None
+
+            try:
+                # Held only while the request is open, a batch backing off frees its slot
+                async with self._batch_slots, self._client.stream("POST", "/evaluate/batch", json=payload) as response:
+                    if response.status_code in RETRY_STATUS_CODES:
+                        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                        raise httpx.HTTPStatusError("Retryable status", request=response.request, response=response)
+                    if response.status_code >= 400:
+                        await response.aread()
+                        raise EvaluatorAPIError(response.status_code, self._error_detail(response))
+
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        item = BatchEvaluationItem.model_validate_json(line)
+                        original_index = indices[item.index]
+                        del remaining[original_index]
+                        yield item.model_copy(update={"index": original_index + offset})
+
+                if remaining:
+                    raise httpx.RemoteProtocolError("Batch stream ended before every article was answered")
+
+            except (httpx.TransportError, httpx.HTTPStatusError):
+                # TransportError covers timeouts and dropped connections
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Exponential backoff with jitter so parallel clients do not retry in lockstep
+        return min(0.5 * 2 ** (attempt - 1), self.max_backoff) * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delay seconds or an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    @staticmethod
+    def _error_detail(response: httpx.Response) -> str:
+        try:
+            return str(response.json().get("detail", response.text))
+        except ValueError:
+            return response.text
+
+    @staticmethod
+    def _unwrap(item: BatchEvaluationItem) -> EvaluationResponse:
+        if item.result is None:
+            raise EvaluatorAPIError(item.status_code, item.error or "Evaluation failed")
+        return item.result
@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import bz2
+import multiprocessing
+import os
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Set
+
+import yaml
+from dotenv import load_dotenv
+
+from evaluator import WikipediaEvaluator
+from schemas import DumpEvaluationRecord
+from tracing import tracer
+from wikitext import clean_pages
+
+# Load business logic from YAML
+with open('config.yaml', 'r') as f:
+    config = yaml.safe_load(f)
+
+
+def _local_name(tag: str) -> str:
+    """Drop the export schema namespace, it changes with every dump version"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_pages(
+    dump_path: str,
+    namespaces: Optional[Set[int]] = None,
+    title_pattern: Optional[str] = None,
+    page_ids: Optional[Set[int]] = None,
+    include_redirects: bool = False
+) -> Iterator[dict]:
+    """
+    Stream pages out of a pages-articles dump (.xml or .xml.bz2)
+
+    The file is decompressed and parsed incrementally and every page element
+    is released once read, so memory stays flat regardless of dump size.
+    """
+
+    title_re = re.compile(title_pattern) if title_pattern else None
+    opener = bz2.open if dump_path.endswith('.bz2') else open
+
+    with opener(dump_path, 'rb') as stream:
+        context = ET.iterparse(stream, events=('start', 'end'))
+        _, root = next(context)
+
+        for event, elem in context:
+            if event != 'end' or _local_name(elem.tag) != 'page':
+                continue
+
+            page = {'redirect': False, 'text': ''}
+            for child in elem:
+                name = _local_name(child.tag)
+                if name in ('title', 'ns', 'id'):
+                    page[name] = child.text
+                elif name == 'redirect':
+                    page['redirect'] = True
+                elif name == 'revision':
+                    for rev_child in child:
+                        if _local_name(rev_child.tag) == 'text':
+                            page['text'] = rev_child.text or ''
+
+            # Finished pages stay attached to the root unless cleared
+            root.clear()
+
+            if namespaces is not None and int(page.get('ns', 0)) not in namespaces:
+                continue
+            if page['redirect'] and not include_redirects:
+                continue
+            page_id = int(page['id'])
+            if page_ids is not None and page_id not in page_ids:
+                continue
+            if title_re and not title_re.search(page['title']):
+                continue
+
+            yield {'page_id': page_id, 'title': page['title'], 'text': page['text']}
+
+
+def load_page_ids(path: str) -> Set[int]:
+    """Read a page-id list, one id per line"""
+    with open(path, 'r') as f:
+        return {int(line) for line in f if line.strip()}
+
+
+async def evaluate_dump(
+    dump_path: str,
+    output_path: str,
+    namespaces: Optional[Set[int]] = None,
+    title_pattern: Optional[str] = None,
+    page_ids: Optional[Set[int]] = None,
+    limit: Optional[int] = None
+) -> int:
+    """
+    Evaluate every matching article in a dump, writing results as they complete
+
+    Parsing runs in a thread, wikitext cleanup on a process pool and evaluation
+    on a fixed set of concurrency workers on the event loop, each taking the
+    next cleaned article as soon as its last call returns. Bounded queues
+    between the stages keep parsing from running far ahead of evaluation.
+    Returns the number of articles evaluated.
+    """
+
+    settings = config['dump_ingest']
+    batch_size = settings['batch_size']
+    workers = settings['workers'] or os.cpu_count()
+    concurrency = settings['concurrency']
+    min_length = config['evaluation']['min_article_length']
+    max_length = config['evaluation']['max_article_length']
+
+    if namespaces is None:
+        namespaces = set(settings['namespaces'])
+
+    pages = iter_pages(dump_path, namespaces, title_pattern, page_ids)
+    if limit:
+        pages = islice(pages, limit)
+
+    evaluator = WikipediaEvaluator()
+    cleaned_batches = asyncio.Queue(maxsize=workers * 2)
+    articles = asyncio.Queue(maxsize=concurrency * 2)
+    loop = asyncio.get_running_loop()
+    evaluated = 0
+
+    async def produce(pool: ProcessPoolExecutor):
+        try:
+            while True:
+                raw_batch = await asyncio.to_thread(lambda: list(islice(pages, batch_size)))
+                if not raw_batch:
+                    break
+                await cleaned_batches.put(loop.run_in_executor(pool, clean_pages, raw_batch))
+        except Exception as e:
+            # A corrupt or truncated dump must reach the consumer, not leave it waiting
+            await cleaned_batches.put(e)
+            return
+        await cleaned_batches.put(None)
+
+    async def distribute():
+        """Unpack cleaned batches in dump order, one queue entry per article"""
+        while (cleaned := await cleaned_batches.get()) is not None:
+            if isinstance(cleaned, Exception):
+                raise cleaned
+            for article in await cleaned:
+                if len(article['text']) >= min_length:
+                    await articles.put(article)
+        for _ in range(concurrency):
+            await articles.put(None)
+
+    async def evaluate_articles(out):
+        nonlocal evaluated
+        while (article := await articles.get()) is not None:
+            text = article['text']
+            truncated = len(text) > max_length
+            if truncated:
+                text = text[:max_length]
+
+            # One trace per page, tagged so it can be found again by page id
+            with tracer.span("dump.evaluate_page", {"page.id": article['page_id'], "page.title": article['title']}):
+                result = await evaluator.evaluate_article(article_text=text, title=article['title'])
+
+            record = DumpEvaluationRecord(
+                page_id=article['page_id'],
+                title=article['title'],
+                truncated=truncated,
+                evaluation=result
+            )
+            out.write(record.model_dump_json() + '\n')
+            out.flush()
+            evaluated += 1
+
+    # Parsing and trace export already run on threads here, forking would copy their locks mid-use
+    mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool, \
+            open(output_path, 'a', encoding='utf-8') as out:
+        tasks = [
+            asyncio.create_task(produce(pool)),
+            asyncio.create_task(distribute()),
+            *(asyncio.create_task(evaluate_articles(out)) for _ in range(concurrency))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    return evaluated
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate articles from a MediaWiki pages-articles dump")
+    parser.add_argument("dump", help="Path to a pages-articles .xml or .xml.bz2 dump")
+    parser.add_argument("-o", "--output", default="dump_evaluations.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--namespace", type=int, action="append", dest="namespaces",
+                        help="Namespace to include, repeatable (default from config.yaml)")
+    parser.add_argument("--title-pattern", help="Only evaluate pages whose title matches this regex")
+    parser.add_argument("--page-ids", help="File with one page id per line to evaluate")
+    parser.add_argument("--limit", type=int, help="Stop after this many matching pages")
+    args = parser.parse_args(argv)
+
+    count = asyncio.run(evaluate_dump(
+        dump_path=args.dump,
+        output_path=args.output,
+        namespaces=set(args.namespaces) if args.namespaces else None,
+        title_pattern=args.title_pattern,
+        page_ids=load_page_ids(args.page_ids) if args.page_ids else None,
+        limit=args.limit
+    ))
+    print(f"Evaluated {count} articles -> {args.output}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    main()
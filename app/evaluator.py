@@ -3,24 +3,45 @@ import yaml
 import os
 from openai import AsyncOpenAI
 from schemas import EvaluationResponse, EvaluationBreakdown
+from tracing import tracer
+from openai_replay import build_http_client, replay_mode
 
 # Load business logic from YAML
 with open('config.yaml', 'r') as f:
     config = yaml.safe_load(f)
 
+class EvaluationError(Exception):
+    """An evaluation that could not be completed, the message is meant for the user"""
+
+
 class WikipediaEvaluator:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, http_client=None):
+        # Replay mode serves recorded responses, so no real key is needed.
+        # Record mode talks to the real API and must fail without one.
+        http_client = http_client or build_http_client()
+        api_key = os.getenv("OPENAI_API_KEY") or ("replay" if replay_mode() == "replay" else None)
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
         self.threshold = config['evaluation']['quality_threshold']
         self.max_article_length = config['evaluation']['max_article_length']
         self.weights = config['evaluation']['weights']
     
     async def evaluate_article(self, article_text: str, title: str = None) -> EvaluationResponse:
         """Evaluate article against Wikipedia's core content policies"""
+        try:
+            return await self.evaluate_article_or_raise(article_text, title)
+        except EvaluationError as e:
+            return self._fallback_response(str(e))
+
+    async def evaluate_article_or_raise(self, article_text: str, title: str = None) -> EvaluationResponse:
+        """Like evaluate_article, but failures raise EvaluationError instead of returning the all-zero fallback"""
         
+        with tracer.span("evaluator.evaluate_article", {"article.length": len(article_text)}):
+            return await self._evaluate_article(article_text, title)
+
+    async def _evaluate_article(self, article_text: str, title: str = None) -> EvaluationResponse:
         # Enhanced input validation
         if len(article_text) > self.max_article_length:
-            return self._fallback_response(
+            raise EvaluationError(
                 f"Article too long ({len(article_text)} chars). Maximum allowed: {self.max_article_length} characters."
             )
         
@@ -28,51 +49,61 @@ class WikipediaEvaluator:
         try:
             article_text.encode('utf-8')
         except UnicodeEncodeError:
-            return self._fallback_response("Article contains invalid characters. Please use UTF-8 encoded text.")
+            raise EvaluationError("Article contains invalid characters. Please use UTF-8 encoded text.")
         
-        prompt = self._build_enhanced_evaluation_prompt(article_text, title)
+        with tracer.span("evaluator.build_prompt"):
+            prompt = self._build_enhanced_evaluation_prompt(article_text, title)
         
         try:
-            response = await self.client.chat.completions.create(
-                model=config['openai']['model'],
-                messages=[
-                    {"role": "system", "content": "You are an expert Wikipedia editor who evaluates articles against Wikipedia's core content policies. You must respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=config['openai']['temperature']
-            )
-            
-            response_text = response.choices[0].message.content.strip()
-            result = json.loads(response_text)
+            with tracer.span("openai.chat_completion", {"openai.model": config['openai']['model']}) as span:
+                response = await self.client.chat.completions.create(
+                    model=config['openai']['model'],
+                    messages=[
+                        {"role": "system", "content": "You are an expert Wikipedia editor who evaluates articles against Wikipedia's core content policies. You must respond with valid JSON only."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=config['openai']['temperature']
+                )
+                if response.usage:
+                    span.set_attribute("openai.prompt_tokens", response.usage.prompt_tokens)
+                    span.set_attribute("openai.completion_tokens", response.usage.completion_tokens)
             
-            # Validate response structure
-            if not self._validate_response_structure(result):
-                return self._fallback_response("Invalid evaluation response format.")
-            
-            # Calculate weighted overall score
-            weighted_score = (
-                result["breakdown"]["npov_score"] * self.weights["npov_score"] +
-                result["breakdown"]["verifiability_score"] * self.weights["verifiability_score"] + 
-                result["breakdown"]["original_research_score"] * self.weights["original_research_score"]
-            )
+            with tracer.span("evaluator.parse_response"):
+                response_text = response.choices[0].message.content.strip()
+                result = json.loads(response_text)
+                
+                # Validate response structure
+                if not self._validate_response_structure(result):
+                    raise EvaluationError("Invalid evaluation response format.")
             
-            return EvaluationResponse(
-                overall_score=int(round(weighted_score)),
-                passes_threshold=weighted_score >= self.threshold,
-                breakdown=EvaluationBreakdown(**result["breakdown"]),
-                feedback=result.get("feedback", ["No specific feedback provided."])
-            )
+            with tracer.span("evaluator.score"):
+                # Calculate weighted overall score
+                weighted_score = (
+                    result["breakdown"]["npov_score"] * self.weights["npov_score"] +
+                    result["breakdown"]["verifiability_score"] * self.weights["verifiability_score"] + 
+                    result["breakdown"]["original_research_score"] * self.weights["original_research_score"]
+                )
+                
+                return EvaluationResponse(
+                    overall_score=int(round(weighted_score)),
+                    passes_threshold=weighted_score >= self.threshold,
+                    breakdown=EvaluationBreakdown(**result["breakdown"]),
+                    feedback=result.get("feedback", ["No specific feedback provided."])
+                )
             
+        except EvaluationError:
+            raise
+        
         except json.JSONDecodeError:
-            return self._fallback_response("Unable to parse evaluation response. Please try again.")
+            raise EvaluationError("Unable to parse evaluation response. Please try again.")
             
         except Exception as e:
             # Log error in production environment
             error_msg = "Evaluation service temporarily unavailable. Please try again in a moment."
             if os.getenv("DEBUG", "false").lower() == "true":
                 error_msg += f" (Debug: {str(e)})"
-            return self._fallback_response(error_msg)
+            raise EvaluationError(error_msg)
 
     def _validate_response_structure(self, result: dict) -> bool:
         """Validate that the response has the expected structure"""
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+import yaml
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from evaluator import EvaluationError, WikipediaEvaluator
+from schemas import DraftSnapshot
+from tracing import tracer
+
+# Load business logic from YAML
+with open('config.yaml', 'r') as f:
+    config = yaml.safe_load(f)
+
+
+class LiveSession:
+    """
+    One editing session on the live evaluation WebSocket
+
+    Every snapshot replaces the pending one: evaluation only starts after the
+    draft has been quiet for the debounce window, a newer snapshot cancels the
+    in-flight upstream call, and only the latest snapshot's result is pushed.
+    Upstream calls are capped per minute for the whole session.
+    """
+
+    def __init__(self, websocket: WebSocket, evaluator: WikipediaEvaluator):
+        self.websocket = websocket
+        self.evaluator = evaluator
+        self.debounce = config['live']['debounce_ms'] / 1000
+        self.max_calls_per_minute = config['live']['max_calls_per_minute']
+        self.min_length = config['evaluation']['min_article_length']
+        self.max_length = config['evaluation']['max_article_length']
+
+        self.session_id = uuid.uuid4().hex
+        self.seq = 0
+        self.task: Optional[asyncio.Task] = None
+        self.call_times = deque()
+        self.last_evaluated = None
+
+    async def run(self):
+        """Receive snapshots until the client disconnects"""
+        try:
+            while True:
+                try:
+                    message = await self.websocket.receive_json()
+                    snapshot = DraftSnapshot(**message)
+                except (json.JSONDecodeError, ValidationError, TypeError):
+                    await self._send({"type": "error", "detail": "Expected a draft with article_text"})
+                    continue
+
+                self.seq = snapshot.seq if snapshot.seq is not None else self.seq + 1
+                if self.task and not self.task.done():
+                    self.task.cancel()
+                self.task = asyncio.create_task(self._evaluate_latest(snapshot, self.seq))
+
+        except WebSocketDisconnect:
+            pass
+        finally:
+            if self.task:
+                self.task.cancel()
+
+    async def _evaluate_latest(self, snapshot: DraftSnapshot, seq: int):
+        await asyncio.sleep(self.debounce)
+
+        text = snapshot.article_text
+        if len(text.strip()) < self.min_length:
+            await self._send({"type": "error", "seq": seq, "detail": f"Keep typing, evaluation starts at {self.min_length} characters"})
+            return
+        if len(text) > self.max_length:
+            await self._send({"type": "error", "seq": seq, "detail": f"Article text too long (max {self.max_length} characters)"})
+            return
+
+        # Unchanged drafts reuse the last result instead of calling upstream again
+        if self.last_evaluated and self.last_evaluated[0] == (text, snapshot.title):
+            await self._send({"type": "result", "seq": seq, "evaluation": self.last_evaluated[1]})
+            return
+
+        wait = self._budget_wait()
+        if wait > 0:
+            await self._send({"type": "throttled", "seq": seq, "retry_after": round(wait, 1)})
+            await asyncio.sleep(wait)
+
+        self.call_times.append(time.monotonic())
+        # WebSocket traffic gets no HTTP root span, each evaluation is its own trace
+        try:
+            with tracer.span("ws.evaluate", {"session.id": self.session_id, "live.seq": seq}):
+                result = await self.evaluator.evaluate_article_or_raise(article_text=text, title=snapshot.title)
+        except EvaluationError as e:
+            # Not cached, sending the same draft again retries it
+            await self._send({"type": "error", "seq": seq, "detail": str(e)})
+            return
+
+        evaluation = result.model_dump()
+        self.last_evaluated = ((text, snapshot.title), evaluation)
+
+        await self._send({"type": "result", "seq": seq, "evaluation": evaluation})
+
+    def _budget_wait(self) -> float:
+        """Seconds until the session may make another upstream call"""
+        now = time.monotonic()
+        while self.call_times and now - self.call_times[0] >= 60:
+            self.call_times.popleft()
+        if len(self.call_times) < self.max_calls_per_minute:
+            return 0.0
+        return 60 - (now - self.call_times[0])
+
+    async def _send(self, message: dict):
+        # Shielded so a newer snapshot cancelling this task cannot cut a frame in half
+        await asyncio.shield(self.websocket.send_json(message))
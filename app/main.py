@@ -1,11 +1,21 @@
+import asyncio
 import yaml
 import os
-from fastapi import FastAPI, HTTPException
+import secrets
+from typing import Optional
+from fastapi import FastAPI, File, Form, Header, HTTPException, Request, UploadFile, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 
-from schemas import ArticleRequest, EvaluationResponse
+from schemas import (
+    ArticleRequest, BatchArticleRequest, BatchEvaluationItem, EvaluationResponse, ProfilingSettings
+)
 from evaluator import WikipediaEvaluator
+from tracing import tracer, profiler, TracingMiddleware
+from live import LiveSession
+from body_limits import BodyLimitMiddleware
+from wikitext import clean_wikitext
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +30,14 @@ app = FastAPI(
     version=config['app']['version']
 )
 
+# Bound request bodies while they are read, before any JSON parsing
+# Added before CORS so CORS wraps it and its 413/415/400 responses stay readable cross-origin
+app.add_middleware(
+    BodyLimitMiddleware,
+    max_body_bytes=config['ingest']['max_body_bytes'],
+    path_limits={"/evaluate/batch": config['ingest']['max_body_bytes'] * config['ingest']['max_batch_size']}
+)
+
 # Enable CORS for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -29,6 +47,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so the root span covers the whole response including streamed bodies
+app.add_middleware(TracingMiddleware, tracer=tracer, profiler=profiler)
+
+def require_admin(admin_token: str):
+    """Admin endpoints stay disabled unless ADMIN_TOKEN is configured"""
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected or not secrets.compare_digest(admin_token, expected):
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+UPLOAD_EXTENSIONS = {".txt", ".wiki"}
+
 # Initialize evaluator
 evaluator = WikipediaEvaluator()
 
@@ -59,36 +88,144 @@ async def evaluate_article(request: ArticleRequest):
     
     Returns alignment score and actionable feedback
     """
+    return await run_evaluation(request.article_text, request.title)
+
+@app.post("/evaluate/batch")
+async def evaluate_batch(request: BatchArticleRequest):
+    """
+    Evaluate several articles in one request
     
-    # Basic validation using config
-    if not request.article_text.strip():
-        raise HTTPException(status_code=400, detail="Article text cannot be empty")
+    Streams one BatchEvaluationItem per line (NDJSON) as each evaluation completes,
+    so results arrive out of order and carry the index of their article
+    """
+    max_size = config['ingest']['max_batch_size']
+    if not request.articles:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one article")
+    if len(request.articles) > max_size:
+        raise HTTPException(status_code=400, detail=f"Batch too large (max {max_size} articles)")
     
-    min_length = config['evaluation']['min_article_length']
-    if len(request.article_text) < min_length:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Article text too short for meaningful evaluation (minimum {min_length} characters)"
-        )
+    async def evaluate_item(index: int, article: ArticleRequest) -> BatchEvaluationItem:
+        try:
+            result = await run_evaluation(article.article_text, article.title)
+            return BatchEvaluationItem(index=index, result=result)
+        except HTTPException as e:
+            return BatchEvaluationItem(index=index, status_code=e.status_code, error=e.detail)
     
-    max_length = config['evaluation']['max_article_length']
-    if len(request.article_text) > max_length:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Article text too long (max {max_length} characters)"
-        )
+    async def stream_results():
+        tasks = [asyncio.ensure_future(evaluate_item(i, a)) for i, a in enumerate(request.articles)]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                item = await completed
+                yield item.model_dump_json() + "\n"
+        finally:
+            # Client went away, stop paying for evaluations nobody will read
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/evaluate/upload", response_model=EvaluationResponse)
+async def evaluate_upload(
+    file: UploadFile = File(...),
+    title: Optional[str] = Form(default=None)
+):
+    """
+    Evaluate an uploaded .txt or .wiki draft
+    
+    Avoids JSON-escaping large drafts, .wiki files are stripped of wikitext markup first
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    if extension not in UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Only .txt and .wiki files are supported")
+    
+    article_text = decode_article(await file.read())
+    if extension == ".wiki":
+        article_text = clean_wikitext(article_text)
+    
+    return await run_evaluation(article_text, title or os.path.splitext(file.filename)[0])
+
+@app.post("/evaluate/text", response_model=EvaluationResponse)
+async def evaluate_text(request: Request, title: Optional[str] = None, wikitext: bool = False):
+    """
+    Evaluate a draft sent as the raw request body (text/plain)
+    
+    The title goes in the query string, set wikitext=true to strip markup first
+    """
+    article_text = decode_article(await request.body())
+    if wikitext:
+        article_text = clean_wikitext(article_text)
+    
+    return await run_evaluation(article_text, title)
+
+def decode_article(body: bytes) -> str:
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Article must be UTF-8 encoded text")
+
+async def run_evaluation(article_text: str, title: Optional[str]) -> EvaluationResponse:
+    """Validate article length and evaluate it, shared by all evaluate endpoints"""
+    
+    # Basic validation using config
+    with tracer.span("evaluate.validate"):
+        if not article_text.strip():
+            raise HTTPException(status_code=400, detail="Article text cannot be empty")
+        
+        min_length = config['evaluation']['min_article_length']
+        if len(article_text) < min_length:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Article text too short for meaningful evaluation (minimum {min_length} characters)"
+            )
+        
+        max_length = config['evaluation']['max_article_length']
+        if len(article_text) > max_length:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Article text too long (max {max_length} characters)"
+            )
     
     # Evaluate the article
     try:
         result = await evaluator.evaluate_article(
-            article_text=request.article_text,
-            title=request.title
+            article_text=article_text,
+            title=title
         )
         return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Evaluation failed: {str(e)}")
 
+@app.websocket("/ws/evaluate")
+async def live_evaluate(websocket: WebSocket):
+    """
+    Live evaluation while typing
+    
+    Send draft snapshots as {"article_text": ..., "title": ..., "seq": ...}, only the
+    result for the latest snapshot is pushed back
+    """
+    await websocket.accept()
+    await LiveSession(websocket, evaluator).run()
+
+@app.get("/admin/profiling", response_model=ProfilingSettings)
+async def get_profiling(x_admin_token: str = Header(default="")):
+    """Current sampled profiling state"""
+    require_admin(x_admin_token)
+    return ProfilingSettings(enabled=profiler.enabled, sample_rate=profiler.sample_rate)
+
+@app.post("/admin/profiling", response_model=ProfilingSettings)
+async def set_profiling(settings: ProfilingSettings, x_admin_token: str = Header(default="")):
+    """
+    Turn sampled profiling on or off
+    
+    Folded stacks for each sampled request are written to the configured output directory
+    """
+    require_admin(x_admin_token)
+    profiler.enabled = settings.enabled
+    if settings.sample_rate is not None:
+        profiler.sample_rate = settings.sample_rate
+    return ProfilingSettings(enabled=profiler.enabled, sample_rate=profiler.sample_rate)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
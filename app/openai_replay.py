@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+import httpx
+
+# Headers that describe the wire encoding rather than the payload, the stored
+# body is already decoded so replaying them would corrupt the response
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class ReplayMissError(Exception):
+    """Raised in replay mode when a request has no recorded interaction"""
+
+
+def request_key(method: str, url: str, body: bytes) -> str:
+    """Match requests on method, path and JSON body, ignoring host, auth and key order"""
+    path = httpx.URL(url).path
+    try:
+        body_text = json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        body_text = body.decode('utf-8', errors='replace')
+    return f"{method} {path} {body_text}"
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport for AsyncOpenAI that records to or replays from a cassette file
+
+    record: forwards to the real API and stores each request/response pair with
+            the latency it took
+    replay: serves stored responses without network access, sleeping for the
+            recorded latency multiplied by latency_scale
+    """
+
+    def __init__(
+        self,
+        cassette_path: str,
+        mode: str = "replay",
+        latency_scale: float = 1.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown replay mode: {mode}")
+
+        self.cassette_path = cassette_path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.replayed_latency = 0.0
+        self.interactions = {}
+
+        if os.path.exists(cassette_path):
+            with open(cassette_path, 'r', encoding='utf-8') as f:
+                for interaction in json.load(f)["interactions"]:
+                    request = interaction["request"]
+                    body = json.dumps(request["body"]).encode('utf-8')
+                    self.interactions[request_key(request["method"], request["url"], body)] = interaction
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette not found: {cassette_path}")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        key = request_key(request.method, str(request.url), body)
+
+        if self.mode == "replay":
+            return await self._replay(key, request)
+        return await self._record(key, request, body)
+
+    async def _replay(self, key: str, request: httpx.Request) -> httpx.Response:
+        interaction = self.interactions.get(key)
+        if interaction is None:
+            raise ReplayMissError(
+                f"No recorded response for {request.method} {request.url.path} in {self.cassette_path}. "
+                "Re-record it with OPENAI_REPLAY_MODE=record."
+            )
+
+        latency = interaction["latency"] * self.latency_scale
+        self.replayed_latency += latency
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        response = interaction["response"]
+        return httpx.Response(
+            status_code=response["status_code"],
+            headers=response["headers"],
+            json=response["body"],
+            request=request
+        )
+
+    async def _record(self, key: str, request: httpx.Request, body: bytes) -> httpx.Response:
+        start_time = time.perf_counter()
+        upstream = await self.transport.handle_async_request(request)
+        content = await upstream.aread()
+        latency = time.perf_counter() - start_time
+
+        headers = {k: v for k, v in upstream.headers.items() if k.lower() not in SKIPPED_HEADERS}
+        if upstream.status_code >= 400:
+            # Auth errors and outages are not worth replaying, pass them on unrecorded
+            return httpx.Response(status_code=upstream.status_code, headers=headers, content=content, request=request)
+
+        self.interactions[key] = {
+            "request": {
+                "method": request.method,
+                "url": str(request.url),
+                "body": json.loads(body) if body else None
+            },
+            "response": {
+                "status_code": upstream.status_code,
+                "headers": headers,
+                "body": json.loads(content) if content else None
+            },
+            "latency": round(latency, 4)
+        }
+        self._save()
+
+        return httpx.Response(
+            status_code=upstream.status_code,
+            headers=headers,
+            content=content,
+            request=request
+        )
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cassette_path) or ".", exist_ok=True)
+        with open(self.cassette_path, 'w', encoding='utf-8') as f:
+            json.dump({"interactions": list(self.interactions.values())}, f, indent=2)
+            f.write('\n')
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def replay_mode() -> str:
+    """OPENAI_REPLAY_MODE: off, record or replay"""
+    return os.getenv("OPENAI_REPLAY_MODE", "off").lower()
+
+
+def build_http_client() -> Optional[httpx.AsyncClient]:
+    """
+    HTTP client for AsyncOpenAI based on OPENAI_REPLAY_MODE
+
+    Returns None when the mode is unset or off, so the OpenAI default client is used.
+    """
+
+    mode = replay_mode()
+    if mode == "off":
+        return None
+
+    transport = RecordReplayTransport(
+        cassette_path=os.getenv("OPENAI_CASSETTE", "tests/fixtures/openai_cassette.json"),
+        mode=mode,
+        latency_scale=float(os.getenv("OPENAI_REPLAY_LATENCY_SCALE", "1.0"))
+    )
+    return httpx.AsyncClient(transport=transport)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class ArticleRequest(BaseModel):
@@ -14,4 +14,28 @@ class EvaluationResponse(BaseModel):
     overall_score: int
     passes_threshold: bool
     breakdown: EvaluationBreakdown
-    feedback: List[str]
\ No newline at end of file
+    feedback: List[str]
+
+class BatchArticleRequest(BaseModel):
+    articles: List[ArticleRequest]
+
+class BatchEvaluationItem(BaseModel):
+    index: int
+    status_code: int = 200
+    result: Optional[EvaluationResponse] = None
+    error: Optional[str] = None
+
+class DraftSnapshot(BaseModel):
+    article_text: str
+    title: Optional[str] = None
+    seq: Optional[int] = None
+
+class ProfilingSettings(BaseModel):
+    enabled: bool
+    sample_rate: Optional[float] = Field(default=None, ge=0.0, le=1.0)
+
+class DumpEvaluationRecord(BaseModel):
+    page_id: int
+    title: str
+    truncated: bool = False
+    evaluation: EvaluationResponse
@@ -0,0 +1,334 @@
+import asyncio
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+import httpx
+import yaml
+
+# Load business logic from YAML
+with open('config.yaml', 'r') as f:
+    config = yaml.safe_load(f)
+
+# Request ids end up in file names, so client-supplied ones must be plain tokens
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def request_id_from(header: Optional[str]) -> str:
+    """Use the client's X-Request-ID when it is a safe token, otherwise generate one"""
+    if header and REQUEST_ID_RE.match(header):
+        return header
+    return uuid.uuid4().hex
+
+
+class Span:
+    """A timed stage of a request, exported with the rest of its trace when the root span ends"""
+
+    __slots__ = ("tracer", "name", "attributes", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "error", "_trace", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Optional[dict] = None):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes) if attributes else {}
+        self.span_id = secrets.token_hex(8)
+        self.error = None
+
+        parent = _current_span.get()
+        if parent is None:
+            self.trace_id = secrets.token_hex(16)
+            self.parent_id = None
+            self._trace = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self._trace = parent._trace
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_ns = time.time_ns()
+        if exc is not None and not isinstance(exc, asyncio.CancelledError):
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+
+        self._trace.append(self)
+        if self.parent_id is None:
+            self.tracer.export(self._trace)
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned when tracing is off, keeps the disabled path to a single attribute check"""
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> dict:
+    """Encode finished spans as an OTLP/HTTP JSON trace export payload"""
+
+    otlp_spans = []
+    for span in spans:
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2 if span.parent_id is None else 1,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "wikipedia-evaluator"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class FileSpanExporter:
+    """Appends one OTLP JSON payload per trace to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, payload: dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(payload) + '\n')
+
+
+class OTLPSpanExporter:
+    """Posts traces to an OTLP/HTTP collector"""
+
+    def __init__(self, endpoint: str):
+        self.url = endpoint.rstrip('/') + '/v1/traces'
+        self.client = httpx.Client(timeout=5.0)
+
+    def export(self, payload: dict):
+        self.client.post(self.url, json=payload)
+
+
+class Tracer:
+    """
+    Creates spans and exports finished traces
+
+    Exporting happens on a background thread, so file writes and collector
+    posts never block the event loop, and exporter errors are dropped there
+    instead of surfacing in the request. When the exporter falls behind by
+    max_queued traces, new ones are discarded.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        exporter=None,
+        service_name: str = "wikipedia-evaluator",
+        max_queued: int = 1000
+    ):
+        self.enabled = enabled and exporter is not None
+        self.exporter = exporter
+        self.service_name = service_name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queued)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def span(self, name: str, attributes: Optional[dict] = None):
+        """Open a span as a child of the current one, or a new trace if there is none"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def current_span(self):
+        return _current_span.get() or _NOOP_SPAN
+
+    def export(self, spans: List[Span]):
+        """Queue a finished trace for the export thread"""
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            pass
+
+    def flush(self):
+        """Block until every queued trace has been exported"""
+        self._queue.join()
+
+    def _start_worker(self):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(to_otlp_json(spans, self.service_name))
+            except Exception:
+                # Losing a trace must never affect the request it describes
+                pass
+            finally:
+                self._queue.task_done()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware wrapping every HTTP request in a root span
+
+    The span (and the profile of a sampled request) only ends once the last
+    body chunk has been sent, so streamed responses keep their stage spans.
+    The request id is echoed back in the X-Request-ID response header.
+    """
+
+    def __init__(self, app, tracer: "Tracer", profiler: "SamplingProfiler"):
+        self.app = app
+        self.tracer = tracer
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = request_id_from(header)
+
+        with self.tracer.span(f"{scope['method']} {scope['path']}", {"request.id": request_id}) as span:
+            async def send_with_request_id(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-request-id", request_id.encode("latin-1"))
+                    ]
+                await send(message)
+
+            if self.profiler.should_sample():
+                with self.profiler.profile(request_id):
+                    await self.app(scope, receive, send_with_request_id)
+            else:
+                await self.app(scope, receive, send_with_request_id)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for a sampled fraction of requests
+
+    A background thread snapshots the event loop thread's stack at a fixed
+    interval and the counts are written as folded stacks, ready for
+    flamegraph.pl or speedscope. Other requests sharing the loop while a
+    sampled request runs show up in its profile too.
+    """
+
+    def __init__(self, sample_rate: float, interval_ms: float, output_dir: str):
+        self.enabled = False
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.output_dir = output_dir
+
+    def should_sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, name: str):
+        # name becomes the output file name, never let it carry a path
+        if not REQUEST_ID_RE.match(name):
+            raise ValueError(f"Unsafe profile name: {name!r}")
+
+        thread_id = threading.get_ident()
+        stacks: Dict[str, int] = Counter()
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(self.interval):
+                frame = sys._current_frames().get(thread_id)
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if names:
+                    stacks[";".join(reversed(names))] += 1
+
+        sampler = threading.Thread(target=sample, name=f"profiler-{name}", daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            self._write(name, stacks)
+
+    def _write(self, name: str, stacks: Dict[str, int]):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{name}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.items():
+                f.write(f"{stack} {count}\n")
+
+
+def _build_exporter(settings: dict):
+    exporter = settings['exporter']
+    if exporter == 'file':
+        return FileSpanExporter(settings['trace_file'])
+    if exporter == 'otlp':
+        return OTLPSpanExporter(os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", settings['otlp_endpoint']))
+    return None
+
+
+tracer = Tracer(
+    enabled=config['observability']['tracing_enabled'],
+    exporter=_build_exporter(config['observability']),
+    service_name=config['app']['title']
+)
+
+profiler = SamplingProfiler(
+    sample_rate=config['observability']['profiling']['sample_rate'],
+    interval_ms=config['observability']['profiling']['interval_ms'],
+    output_dir=config['observability']['profiling']['output_dir']
+)
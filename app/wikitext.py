@@ -0,0 +1,55 @@
+import re
+from typing import List
+
+# Markup patterns for turning raw wikitext into plain article prose.
+# Kept at module level so every pool worker compiles them once.
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+REF_RE = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+INNER_TEMPLATE_RE = re.compile(r"\{\{[^{}]*\}\}")
+TABLE_RE = re.compile(r"^\{\|.*?^\|\}", re.DOTALL | re.MULTILINE)
+FILE_LINK_RE = re.compile(r"\[\[(?:File|Image|Category):[^\[\]]*(?:\[\[[^\]]*\]\][^\[\]]*)*\]\]", re.IGNORECASE)
+PIPED_LINK_RE = re.compile(r"\[\[[^\[\]|]*\|([^\[\]]*)\]\]")
+PLAIN_LINK_RE = re.compile(r"\[\[([^\[\]]*)\]\]")
+EXTERNAL_LINK_RE = re.compile(r"\[https?://[^\s\]]+\s*([^\]]*)\]")
+HEADING_RE = re.compile(r"^=+\s*(.*?)\s*=+\s*$", re.MULTILINE)
+EMPHASIS_RE = re.compile(r"'{2,}")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+SPACES_RE = re.compile(r"[ \t]+")
+
+# Citations are kept as a marker because the verifiability score depends on them
+CITATION_MARKER = "[citation]"
+
+
+def clean_wikitext(text: str) -> str:
+    """Strip wikitext markup down to the readable article text"""
+
+    text = COMMENT_RE.sub("", text)
+    text = REF_RE.sub(CITATION_MARKER, text)
+
+    # Templates nest, so remove the innermost ones until none are left
+    previous = None
+    while previous != text:
+        previous = text
+        text = INNER_TEMPLATE_RE.sub("", text)
+
+    text = TABLE_RE.sub("", text)
+    text = FILE_LINK_RE.sub("", text)
+    text = PIPED_LINK_RE.sub(r"\1", text)
+    text = PLAIN_LINK_RE.sub(r"\1", text)
+    text = EXTERNAL_LINK_RE.sub(r"\1", text)
+    text = HEADING_RE.sub(r"\1", text)
+    text = EMPHASIS_RE.sub("", text)
+    text = HTML_TAG_RE.sub("", text)
+    text = SPACES_RE.sub(" ", text)
+    text = BLANK_LINES_RE.sub("\n\n", text)
+
+    return "\n".join(line.strip() for line in text.splitlines()).strip()
+
+
+def clean_pages(pages: List[dict]) -> List[dict]:
+    """Clean a batch of raw dump pages, meant to run inside a worker process"""
+    return [
+        {"page_id": page["page_id"], "title": page["title"], "text": clean_wikitext(page["text"])}
+        for page in pages
+    ]
@@ -1,11 +1,27 @@
 import gradio as gr
 import httpx
+import os
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from client import EvaluatorAPIError, EvaluatorClient
+
 # API Configuration
 API_BASE_URL = "http://localhost:8000"
 
-def evaluate_article(article_text, title=""):
+# Shared by every request so connections to the API are reused
+client = None
+
+def get_client():
+    global client
+    if client is None:
+        # Someone is waiting on the page, fail within seconds rather than retrying for minutes
+        client = EvaluatorClient(base_url=API_BASE_URL, timeout=15.0, max_retries=1, max_backoff=2.0)
+    return client
+
+async def evaluate_article(article_text, title=""):
     """Evaluate article using the FastAPI backend"""
     
     if not article_text.strip():
@@ -17,27 +33,15 @@ def evaluate_article(article_text, title=""):
     try:
         start_time = time.time()
         
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{API_BASE_URL}/evaluate",
-                json={
-                    "article_text": article_text,
-                    "title": title if title.strip() else None
-                }
-            )
+        result = await get_client().evaluate(article_text, title=title if title.strip() else None)
         
         end_time = time.time()
         
-        if response.status_code != 200:
-            return "❌ Error", f"API Error: {response.text}", "", "", "", ""
-        
-        result = response.json()
-        
         # Format the results
-        overall_score = result["overall_score"]
-        passes = result["passes_threshold"]
-        breakdown = result["breakdown"]
-        feedback = result["feedback"]
+        overall_score = result.overall_score
+        passes = result.passes_threshold
+        breakdown = result.breakdown
+        feedback = result.feedback
         
         # Score status
         if passes:
@@ -49,15 +53,17 @@ def evaluate_article(article_text, title=""):
         performance = f"⚡ Evaluated in {end_time - start_time:.1f}s"
         
         # Breakdown scores
-        npov_score = f"🔍 Neutral Point of View: {breakdown['npov_score']}/100"
-        verify_score = f"📚 Verifiability: {breakdown['verifiability_score']}/100"
-        research_score = f"🔬 No Original Research: {breakdown['original_research_score']}/100"
+        npov_score = f"🔍 Neutral Point of View: {breakdown.npov_score}/100"
+        verify_score = f"📚 Verifiability: {breakdown.verifiability_score}/100"
+        research_score = f"🔬 No Original Research: {breakdown.original_research_score}/100"
         
         # Feedback formatting
         feedback_text = "\n\n".join([f"• {item}" for item in feedback])
         
         return status, performance, npov_score, verify_score, research_score, feedback_text
         
+    except EvaluatorAPIError as e:
+        return "❌ Error", f"API Error: {e.detail}", "", "", "", ""
     except httpx.ConnectError:
         return "❌ Error", "Cannot connect to evaluation API. Make sure the server is running on localhost:8000", "", "", "", ""
     except httpx.ReadTimeout:
@@ -0,0 +1,76 @@
+import json
+import os
+import re
+import sys
+
+import httpx
+import pytest
+
+TESTS_DIR = os.path.dirname(__file__)
+CASSETTE = os.path.join(TESTS_DIR, "fixtures", "openai_cassette.json")
+ARTICLES = os.path.join(TESTS_DIR, "fixtures", "articles.json")
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "app"))
+
+
+class ReplayApp:
+    """The API app with OpenAI served from the recorded cassette instead of the network"""
+
+    def __init__(self, main):
+        self.main = main
+        self.app = main.app
+        self.transport = None
+
+    def use_cassette(self, latency_scale: float = 0.0):
+        """Swap in a fresh replay evaluator and return its transport"""
+        from evaluator import WikipediaEvaluator
+        from openai_replay import RecordReplayTransport
+
+        self.transport = RecordReplayTransport(CASSETTE, mode="replay", latency_scale=latency_scale)
+        self.main.evaluator = WikipediaEvaluator(http_client=httpx.AsyncClient(transport=self.transport))
+        return self.transport
+
+
+@pytest.fixture
+def replay_app(monkeypatch):
+    """main imported in replay mode, its evaluator and config restored afterwards"""
+    monkeypatch.setenv("OPENAI_REPLAY_MODE", "replay")
+    monkeypatch.setenv("OPENAI_CASSETTE", CASSETTE)
+
+    import main
+    from tracing import tracer
+
+    # Tests that check spans swap in their own exporter, the rest must not write traces
+    monkeypatch.setattr(tracer, "enabled", False)
+
+    original_evaluator = main.evaluator
+    replay = ReplayApp(main)
+    replay.use_cassette()
+    yield replay
+    main.evaluator = original_evaluator
+
+
+@pytest.fixture
+def articles() -> dict:
+    """Sample drafts keyed by title, the same ones recorded in the cassette"""
+    with open(ARTICLES, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def recorded_scores() -> dict:
+    """Overall score per title, computed from the breakdowns recorded in the cassette"""
+    from evaluator import config
+
+    weights = config['evaluation']['weights']
+    with open(CASSETTE, 'r', encoding='utf-8') as f:
+        interactions = json.load(f)["interactions"]
+
+    scores = {}
+    for interaction in interactions:
+        prompt = interaction["request"]["body"]["messages"][1]["content"]
+        title = re.search(r"Title: (.*)", prompt).group(1)
+        content = json.loads(interaction["response"]["body"]["choices"][0]["message"]["content"])
+        weighted = sum(content["breakdown"][key] * weight for key, weight in weights.items())
+        scores[title] = int(round(weighted))
+    return scores
@@ -0,0 +1,39 @@
+import asyncio
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Re-record the OpenAI cassette used by the replay tests, needs a real OPENAI_API_KEY.
+# Run from the repository root: python tests/record_cassette.py
+load_dotenv()
+os.environ["OPENAI_REPLAY_MODE"] = "record"
+
+TESTS_DIR = os.path.dirname(__file__)
+CASSETTE = os.path.join(TESTS_DIR, "fixtures", "openai_cassette.json")
+ARTICLES = os.path.join(TESTS_DIR, "fixtures", "articles.json")
+os.environ["OPENAI_CASSETTE"] = CASSETTE
+
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "app"))
+
+from evaluator import WikipediaEvaluator
+
+
+async def record():
+    with open(ARTICLES, 'r', encoding='utf-8') as f:
+        articles = json.load(f)
+
+    # Fails without an API key, before the old cassette is touched
+    evaluator = WikipediaEvaluator()
+
+    # Start from an empty cassette so stale interactions do not linger
+    if os.path.exists(CASSETTE):
+        os.remove(CASSETTE)
+    for title, article_text in articles.items():
+        result = await evaluator.evaluate_article(article_text=article_text, title=title)
+        print(f"{title}: {result.overall_score}/100")
+
+
+if __name__ == "__main__":
+    asyncio.run(record())
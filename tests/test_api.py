@@ -1,14 +1,26 @@
-import httpx
+import asyncio
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from client import EvaluatorClient
 
 # Test the API with sample articles
 BASE_URL = "http://localhost:8000"
 
+async def evaluate(article_text, title):
+    async with EvaluatorClient(base_url=BASE_URL) as client:
+        return await client.evaluate(article_text, title=title)
+
 def test_health():
     """Test health endpoint"""
-    with httpx.Client() as client:
-        response = client.get(f"{BASE_URL}/health")
-        print("Health Check:", response.json())
+    async def health():
+        async with EvaluatorClient(base_url=BASE_URL) as client:
+            return await client.health()
+    
+    print("Health Check:", asyncio.run(health()))
 
 def test_good_article():
     """Test with a well-written article"""
@@ -20,16 +32,9 @@ def test_good_article():
     Mitigation efforts include transitioning to renewable energy sources, improving energy efficiency, and implementing carbon pricing mechanisms. The Paris Agreement, adopted in 2015, aims to limit global warming to well below 2°C above pre-industrial levels.
     """
     
-    with httpx.Client() as client:
-        response = client.post(
-            f"{BASE_URL}/evaluate",
-            json={
-                "article_text": good_article,
-                "title": "Climate Change"
-            }
-        )
-        print("Good Article Result:")
-        print(json.dumps(response.json(), indent=2))
+    result = asyncio.run(evaluate(good_article, "Climate Change"))
+    print("Good Article Result:")
+    print(json.dumps(result.model_dump(), indent=2))
 
 def test_biased_article():
     """Test with a biased article"""
@@ -41,16 +46,9 @@ def test_biased_article():
     Based on my own research and personal experience, electric cars never break down and are always cheaper to maintain. I've never seen any evidence that suggests otherwise.
     """
     
-    with httpx.Client() as client:
-        response = client.post(
-            f"{BASE_URL}/evaluate",
-            json={
-                "article_text": biased_article,
-                "title": "Electric Cars"
-            }
-        )
-        print("\nBiased Article Result:")
-        print(json.dumps(response.json(), indent=2))
+    result = asyncio.run(evaluate(biased_article, "Electric Cars"))
+    print("\nBiased Article Result:")
+    print(json.dumps(result.model_dump(), indent=2))
 
 if __name__ == "__main__":
     print("Testing Wikipedia Evaluator API...")
@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+
+from client import EvaluatorAPIError, EvaluatorClient
+from schemas import ArticleRequest
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Runs the app in-process, counts requests and can answer the first ones with 503"""
+
+    def __init__(self, app, unavailable: int = 0):
+        self.app_transport = httpx.ASGITransport(app=app)
+        self.unavailable = unavailable
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.unavailable:
+            self.unavailable -= 1
+            return httpx.Response(503, headers={"Retry-After": "0"}, request=request)
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # Give other batches the chance to overlap with this one
+            await asyncio.sleep(0.01)
+            return await self.app_transport.handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+
+def test_concurrent_calls_share_one_batch(replay_app, articles, recorded_scores):
+    """Test concurrent evaluate calls go out as a single batch request"""
+    transport = CountingTransport(replay_app.app)
+
+    async def run():
+        async with EvaluatorClient(base_url="http://testserver", transport=transport) as client:
+            return await asyncio.gather(*(
+                client.evaluate(article_text, title=title) for title, article_text in articles.items()
+            ))
+
+    results = asyncio.run(run())
+    print("Batched results:", [result.overall_score for result in results])
+    assert len(transport.requests) == 1
+    assert [result.overall_score for result in results] == [recorded_scores[title] for title in articles]
+
+
+def test_retries_on_503(replay_app, articles, recorded_scores):
+    """Test 503 responses are retried after Retry-After"""
+    transport = CountingTransport(replay_app.app, unavailable=2)
+
+    async def run():
+        async with EvaluatorClient(base_url="http://testserver", transport=transport) as client:
+            return await client.evaluate(articles["Climate Change"], title="Climate Change")
+
+    result = asyncio.run(run())
+    assert len(transport.requests) == 3
+    assert result.overall_score == recorded_scores["Climate Change"]
+
+
+def test_stream_and_rejections(replay_app, articles, recorded_scores):
+    """Test evaluate_many streams results and per-article errors raise"""
+    transport = CountingTransport(replay_app.app)
+    titles = list(articles)
+
+    async def run():
+        async with EvaluatorClient(base_url="http://testserver", transport=transport) as client:
+            requests = [ArticleRequest(article_text=articles[title], title=title) for title in titles]
+            streamed = {index: result.overall_score async for index, result in client.evaluate_many(requests)}
+
+            try:
+                await client.evaluate("Too short")
+                rejected = None
+            except EvaluatorAPIError as e:
+                rejected = e
+            return streamed, rejected
+
+    streamed, rejected = asyncio.run(run())
+    print("Streamed:", streamed, "Rejected:", rejected)
+    assert streamed == {index: recorded_scores[title] for index, title in enumerate(titles)}
+    assert rejected is not None and rejected.status_code == 400
+
+
+def test_in_flight_batches_bounded(replay_app, articles, recorded_scores):
+    """Test evaluate_many keeps at most max_connections batches in flight"""
+    transport = CountingTransport(replay_app.app)
+    titles = list(articles) * 3
+
+    async def run():
+        async with EvaluatorClient(
+            base_url="http://testserver", transport=transport, batch_size=1, max_connections=2
+        ) as client:
+            requests = [ArticleRequest(article_text=articles[title], title=title) for title in titles]
+            return {index: result.overall_score async for index, result in client.evaluate_many(requests)}
+
+    streamed = asyncio.run(run())
+    print("Requests:", len(transport.requests), "Peak in flight:", transport.peak_in_flight)
+    assert len(transport.requests) == len(titles)
+    assert transport.peak_in_flight == 2
+    assert streamed == {index: recorded_scores[title] for index, title in enumerate(titles)}
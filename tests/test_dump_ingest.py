@@ -0,0 +1,195 @@
+import asyncio
+import bz2
+import json
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+import dump_ingest
+from dump_ingest import evaluate_dump, iter_pages
+from schemas import EvaluationBreakdown, EvaluationResponse
+from wikitext import clean_wikitext
+
+# Minimal pages-articles export with an article, a redirect and a talk page
+SAMPLE_DUMP = """<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" version="0.10">
+  <siteinfo><sitename>Wikipedia</sitename></siteinfo>
+  <page>
+    <title>Python (programming language)</title>
+    <ns>0</ns>
+    <id>23862</id>
+    <revision>
+      <id>111</id>
+      <text>{{Infobox language|name=Python}}'''Python''' is a [[programming language|language]] created by [[Guido van Rossum]].&lt;ref&gt;{{cite web|url=https://python.org}}&lt;/ref&gt;
+== History ==
+Released in 1991.[[Category:Programming languages]]</text>
+    </revision>
+  </page>
+  <page>
+    <title>Python language</title>
+    <ns>0</ns>
+    <id>23863</id>
+    <redirect title="Python (programming language)" />
+    <revision><id>112</id><text>#REDIRECT [[Python (programming language)]]</text></revision>
+  </page>
+  <page>
+    <title>Talk:Python (programming language)</title>
+    <ns>1</ns>
+    <id>23864</id>
+    <revision><id>113</id><text>Discussion</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+def write_sample_dump() -> str:
+    """Write the sample export as a bz2 dump and return its path"""
+    fd, path = tempfile.mkstemp(suffix=".xml.bz2")
+    with os.fdopen(fd, "wb") as f:
+        f.write(bz2.compress(SAMPLE_DUMP.encode("utf-8")))
+    return path
+
+
+def test_iter_pages_filters():
+    """Test namespace, redirect, title and page-id filtering"""
+    path = write_sample_dump()
+    try:
+        articles = list(iter_pages(path, namespaces={0}))
+        print("Articles:", [page["title"] for page in articles])
+        assert [page["page_id"] for page in articles] == [23862]
+
+        talk = list(iter_pages(path, namespaces={1}))
+        assert [page["title"] for page in talk] == ["Talk:Python (programming language)"]
+
+        assert list(iter_pages(path, namespaces={0}, title_pattern="^Java")) == []
+        assert list(iter_pages(path, namespaces=None, page_ids={23864}))[0]["page_id"] == 23864
+    finally:
+        os.remove(path)
+
+
+def test_clean_wikitext():
+    """Test markup stripping keeps prose and citation markers"""
+    path = write_sample_dump()
+    try:
+        page = next(iter_pages(path, namespaces={0}))
+    finally:
+        os.remove(path)
+
+    cleaned = clean_wikitext(page["text"])
+    print("Cleaned:", cleaned)
+    assert cleaned == (
+        "Python is a language created by Guido van Rossum.[citation]\n"
+        "History\n"
+        "Released in 1991."
+    )
+
+
+def write_article_dump(path: str, articles: dict, compressed_fraction: float = 1.0):
+    """Write the sample drafts as main-namespace pages, optionally cut short"""
+    pages = "".join(
+        f"<page><title>{escape(title)}</title><ns>0</ns><id>{page_id}</id>"
+        f"<revision><id>{page_id + 1000}</id><text>{escape(text)}</text></revision></page>"
+        for page_id, (title, text) in enumerate(articles.items(), start=1)
+    )
+    stub = "<page><title>Stub</title><ns>0</ns><id>99</id><revision><id>1099</id><text>Too short</text></revision></page>"
+    export = f'<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/">{pages}{stub}</mediawiki>'
+
+    data = bz2.compress(export.encode("utf-8"))
+    with open(path, "wb") as f:
+        f.write(data[:int(len(data) * compressed_fraction)])
+
+
+@pytest.fixture
+def dump_settings(replay_app, monkeypatch):
+    """Replay evaluator without latency, tiny batches so several go through the pool"""
+    monkeypatch.setenv("OPENAI_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setitem(dump_ingest.config['dump_ingest'], 'batch_size', 1)
+    monkeypatch.setitem(dump_ingest.config['dump_ingest'], 'workers', 2)
+
+
+@pytest.fixture
+def dump_cassette(dump_settings, articles, tmp_path, monkeypatch):
+    """
+    The recorded interactions, keyed on the cleaned article text
+
+    Dump pages go through clean_wikitext before evaluation, which strips the
+    drafts' indentation, so their prompts differ from the recorded ones. The
+    recorded responses are reused for the cleaned prompts in a temporary copy.
+    """
+    with open(os.environ["OPENAI_CASSETTE"], "r", encoding="utf-8") as f:
+        cassette = json.load(f)
+
+    for interaction in cassette["interactions"]:
+        message = interaction["request"]["body"]["messages"][1]
+        article_text = next(text for text in articles.values() if text in message["content"])
+        message["content"] = message["content"].replace(article_text, clean_wikitext(article_text))
+
+    path = tmp_path / "dump_cassette.json"
+    path.write_text(json.dumps(cassette), encoding="utf-8")
+    monkeypatch.setenv("OPENAI_CASSETTE", str(path))
+
+
+def test_evaluate_dump(dump_cassette, articles, recorded_scores, tmp_path):
+    """Test a dump runs through parsing, the cleanup pool and evaluation into JSONL"""
+    dump_path = str(tmp_path / "pages-articles.xml.bz2")
+    output_path = str(tmp_path / "results.jsonl")
+    write_article_dump(dump_path, articles)
+
+    count = asyncio.run(asyncio.wait_for(evaluate_dump(dump_path, output_path), timeout=30))
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    print("Records:", [(record["title"], record["evaluation"]["overall_score"]) for record in records])
+
+    # The stub page is below min_article_length and never evaluated
+    assert count == len(articles)
+    assert {record["title"]: record["evaluation"]["overall_score"] for record in records} == recorded_scores
+
+
+def test_evaluate_dump_truncated(dump_settings, articles, tmp_path):
+    """Test a truncated dump raises instead of hanging the pipeline"""
+    dump_path = str(tmp_path / "truncated.xml.bz2")
+    write_article_dump(dump_path, articles, compressed_fraction=0.5)
+
+    with pytest.raises((EOFError, OSError, SyntaxError)):
+        asyncio.run(asyncio.wait_for(evaluate_dump(dump_path, str(tmp_path / "results.jsonl")), timeout=10))
+
+
+class SlowFirstEvaluator:
+    """Answers instantly except for one title, which takes far longer than the rest"""
+
+    def __init__(self, slow_title: str):
+        self.slow_title = slow_title
+
+    async def evaluate_article(self, article_text: str, title: str = None) -> EvaluationResponse:
+        if title == self.slow_title:
+            await asyncio.sleep(1.0)
+        return EvaluationResponse(
+            overall_score=50,
+            passes_threshold=False,
+            breakdown=EvaluationBreakdown(npov_score=50, verifiability_score=50, original_research_score=50),
+            feedback=[]
+        )
+
+
+def test_slow_evaluation_does_not_hold_back_later_pages(dump_settings, articles, tmp_path, monkeypatch):
+    """Test later pages keep flowing while one evaluation is slow"""
+    article_text = articles["Climate Change"]
+    drafts = {f"Page {number}": article_text for number in range(6)}
+    monkeypatch.setattr(dump_ingest, "WikipediaEvaluator", lambda: SlowFirstEvaluator("Page 0"))
+    monkeypatch.setitem(dump_ingest.config['dump_ingest'], 'batch_size', 2)
+    monkeypatch.setitem(dump_ingest.config['dump_ingest'], 'concurrency', 2)
+
+    dump_path = str(tmp_path / "pages-articles.xml.bz2")
+    output_path = str(tmp_path / "results.jsonl")
+    write_article_dump(dump_path, drafts)
+    asyncio.run(asyncio.wait_for(evaluate_dump(dump_path, output_path), timeout=30))
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        titles = [json.loads(line)["title"] for line in f]
+    print("Completion order:", titles)
+
+    # The other worker drains every later batch before the slow page finishes
+    assert titles[-1] == "Page 0"
+    assert sorted(titles) == sorted(drafts)
@@ -0,0 +1,46 @@
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+# Server-side time allowed per /evaluate call on top of the upstream latency
+OVERHEAD_BUDGET_SECONDS = 0.05
+# Recorded latency is scaled down so the budget test stays quick
+LATENCY_SCALE = 0.1
+
+
+def test_replayed_evaluations(replay_app, articles, recorded_scores):
+    """Test the full /evaluate path returns the recorded scores"""
+    client = TestClient(replay_app.app)
+    threshold = replay_app.main.config['evaluation']['quality_threshold']
+
+    for title, article_text in articles.items():
+        response = client.post("/evaluate", json={"article_text": article_text, "title": title})
+        print(f"{title} Result:", response.json())
+
+        assert response.status_code == 200
+        assert response.json()["overall_score"] == recorded_scores[title]
+        assert response.json()["passes_threshold"] == (recorded_scores[title] >= threshold)
+
+
+def test_evaluate_overhead_budget(replay_app, articles):
+    """Test server-side overhead of /evaluate stays within budget"""
+    transport = replay_app.use_cassette(latency_scale=LATENCY_SCALE)
+    client = TestClient(replay_app.app)
+    payload = {"article_text": articles["Climate Change"], "title": "Climate Change"}
+
+    # Warm up lazy imports and the first-request setup
+    client.post("/evaluate", json=payload)
+
+    overheads = []
+    for _ in range(5):
+        replayed_before = transport.replayed_latency
+        start_time = time.perf_counter()
+        response = client.post("/evaluate", json=payload)
+        elapsed = time.perf_counter() - start_time
+        assert response.status_code == 200
+        overheads.append(elapsed - (transport.replayed_latency - replayed_before))
+
+    overhead = statistics.median(overheads)
+    print(f"Median server overhead: {overhead * 1000:.1f}ms (budget {OVERHEAD_BUDGET_SECONDS * 1000:.0f}ms)")
+    assert overhead < OVERHEAD_BUDGET_SECONDS
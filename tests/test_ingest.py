@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import json
+
+from fastapi.testclient import TestClient
+
+from body_limits import BodyLimitMiddleware
+
+
+def test_gzip_body(replay_app, articles, recorded_scores):
+    """Test gzip-compressed JSON bodies are inflated before parsing"""
+    body = gzip.compress(json.dumps({"article_text": articles["Climate Change"], "title": "Climate Change"}).encode("utf-8"))
+    response = TestClient(replay_app.app).post(
+        "/evaluate",
+        content=body,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    )
+    print("Gzip Result:", response.json())
+    assert response.status_code == 200
+    assert response.json()["overall_score"] == recorded_scores["Climate Change"]
+
+
+def test_oversized_body_rejected(replay_app):
+    """Test oversized bodies are rejected by declared and streamed size"""
+    client = TestClient(replay_app.app)
+    max_body_bytes = replay_app.main.config['ingest']['max_body_bytes']
+    oversized = b'{"article_text": "' + b"a" * max_body_bytes + b'"}'
+
+    declared = client.post("/evaluate", content=oversized, headers={"Content-Type": "application/json"})
+    assert declared.status_code == 413
+
+    # No Content-Length, the limit has to trip while streaming
+    def chunks():
+        for start in range(0, len(oversized), 16384):
+            yield oversized[start:start + 16384]
+
+    streamed = client.post("/evaluate", content=chunks(), headers={"Content-Type": "application/json"})
+    assert streamed.status_code == 413
+
+    # A small gzip body that inflates past the limit
+    bomb = gzip.compress(oversized)
+    inflated = client.post(
+        "/evaluate",
+        content=bomb,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    )
+    print("Gzip bomb:", len(bomb), "bytes ->", inflated.json())
+    assert inflated.status_code == 413
+
+
+def test_rejections_carry_cors_headers(replay_app):
+    """Test body limit rejections are readable by cross-origin frontends"""
+    client = TestClient(replay_app.app)
+    max_body_bytes = replay_app.main.config['ingest']['max_body_bytes']
+
+    response = client.post(
+        "/evaluate",
+        content=b"a" * (max_body_bytes + 1),
+        headers={"Content-Type": "application/json", "Origin": "http://localhost:7860"}
+    )
+    assert response.status_code == 413
+    assert "access-control-allow-origin" in response.headers
+
+
+def test_truncated_and_abandoned_bodies(articles):
+    """Test truncated gzip bodies are rejected and disconnects never reach the app"""
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(await receive())
+
+    middleware = BodyLimitMiddleware(app, max_body_bytes=1024 * 1024)
+
+    def run(messages, headers):
+        scope = {"type": "http", "method": "POST", "path": "/evaluate", "headers": headers}
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(middleware(scope, receive, send))
+        return sent
+
+    body = gzip.compress(articles["Climate Change"].encode("utf-8"))
+    truncated = run(
+        [{"type": "http.request", "body": body[:len(body) // 2], "more_body": False}],
+        [(b"content-encoding", b"gzip")]
+    )
+    assert truncated[0]["status"] == 400
+
+    abandoned = run(
+        [{"type": "http.request", "body": b'{"article_text": "', "more_body": True}, {"type": "http.disconnect"}],
+        []
+    )
+    assert abandoned == []
+    assert calls == []
+
+
+def test_file_and_raw_text_upload(replay_app, articles, recorded_scores):
+    """Test .txt uploads and raw text bodies skip the JSON envelope"""
+    client = TestClient(replay_app.app)
+    article_text = articles["Climate Change"]
+
+    uploaded = client.post(
+        "/evaluate/upload",
+        files={"file": ("Climate Change.txt", article_text.encode("utf-8"), "text/plain")}
+    )
+    print("Upload Result:", uploaded.json())
+    assert uploaded.status_code == 200
+    assert uploaded.json()["overall_score"] == recorded_scores["Climate Change"]
+
+    raw = client.post(
+        "/evaluate/text",
+        params={"title": "Climate Change"},
+        content=article_text.encode("utf-8"),
+        headers={"Content-Type": "text/plain; charset=utf-8"}
+    )
+    assert raw.status_code == 200
+    assert raw.json()["overall_score"] == recorded_scores["Climate Change"]
+
+    rejected = client.post("/evaluate/upload", files={"file": ("draft.pdf", b"%PDF-1.7", "application/pdf")})
+    assert rejected.status_code == 400
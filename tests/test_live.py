@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from evaluator import EvaluationError
+
+
+@pytest.fixture
+def live_client(replay_app, monkeypatch):
+    """App with a short debounce and upstream calls replayed at their recorded latency"""
+    import live
+
+    monkeypatch.setitem(live.config['live'], 'debounce_ms', 50)
+    replay_app.use_cassette(latency_scale=1.0)
+
+    def connect(max_calls_per_minute: int = 10):
+        monkeypatch.setitem(live.config['live'], 'max_calls_per_minute', max_calls_per_minute)
+        return TestClient(replay_app.app).websocket_connect("/ws/evaluate")
+
+    return connect
+
+
+def test_debounce_keeps_latest_snapshot(live_client, articles, recorded_scores):
+    """Test rapid snapshots collapse into one evaluation of the latest"""
+    with live_client() as ws:
+        ws.send_json({"article_text": articles["Climate Change"], "title": "Climate Change"})
+        ws.send_json({"article_text": articles["Electric Cars"], "title": "Electric Cars"})
+
+        message = ws.receive_json()
+        print("Live result:", message)
+        assert message["type"] == "result"
+        assert message["seq"] == 2
+        assert message["evaluation"]["overall_score"] == recorded_scores["Electric Cars"]
+
+
+def test_newer_snapshot_cancels_inflight_call(live_client, articles, recorded_scores):
+    """Test a stale upstream call is cancelled instead of pushed"""
+    with live_client() as ws:
+        ws.send_json({"article_text": articles["Climate Change"], "title": "Climate Change", "seq": 1})
+        # Past the debounce window, so the first call is already in flight
+        time.sleep(0.3)
+        ws.send_json({"article_text": articles["Electric Cars"], "title": "Electric Cars", "seq": 2})
+
+        message = ws.receive_json()
+        print("Live result:", message)
+        assert message["seq"] == 2
+        assert message["evaluation"]["overall_score"] == recorded_scores["Electric Cars"]
+
+
+def test_session_call_budget(live_client, articles):
+    """Test the per-session upstream budget throttles further calls"""
+    with live_client(max_calls_per_minute=1) as ws:
+        ws.send_json({"article_text": articles["Climate Change"], "title": "Climate Change"})
+        assert ws.receive_json()["type"] == "result"
+
+        ws.send_json({"article_text": articles["Electric Cars"], "title": "Electric Cars"})
+        message = ws.receive_json()
+        print("Throttled:", message)
+        assert message["type"] == "throttled"
+        assert 0 < message["retry_after"] <= 60
+
+
+def test_invalid_json_and_failed_calls(live_client, replay_app, articles, recorded_scores, monkeypatch):
+    """Test malformed frames get an error and only successful evaluations are cached"""
+    evaluator = replay_app.main.evaluator
+    evaluate_article_or_raise = evaluator.evaluate_article_or_raise
+    calls = []
+
+    async def fail_first_call(**kwargs):
+        calls.append(kwargs["title"])
+        if len(calls) == 1:
+            raise EvaluationError("Evaluation service temporarily unavailable.")
+        return await evaluate_article_or_raise(**kwargs)
+
+    monkeypatch.setattr(evaluator, "evaluate_article_or_raise", fail_first_call)
+    snapshot = {"article_text": articles["Climate Change"], "title": "Climate Change"}
+
+    with live_client() as ws:
+        ws.send_text("{not json")
+        message = ws.receive_json()
+        assert message["type"] == "error"
+
+        ws.send_json(snapshot)
+        message = ws.receive_json()
+        assert message["type"] == "error"
+        assert message["detail"] == "Evaluation service temporarily unavailable."
+
+        # Same draft again, the failure is not cached so upstream is called again
+        ws.send_json(snapshot)
+        message = ws.receive_json()
+        print("Retried result:", message)
+        assert message["evaluation"]["overall_score"] == recorded_scores["Climate Change"]
+        assert len(calls) == 2
+
+        # A completed evaluation is cached whatever its scores
+        ws.send_json(snapshot)
+        assert ws.receive_json()["evaluation"]["overall_score"] == recorded_scores["Climate Change"]
+        assert len(calls) == 2
@@ -0,0 +1,131 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from tracing import tracer
+
+
+class FailingExporter:
+    """Fails every export, like a full disk or an unreachable collector"""
+
+    def export(self, payload: dict):
+        raise OSError("No space left on device")
+
+
+class CapturingExporter:
+    """Keeps exported OTLP payloads in memory"""
+
+    def __init__(self):
+        self.payloads = []
+
+    def export(self, payload: dict):
+        self.payloads.append(payload)
+
+    def spans(self) -> list:
+        return [
+            span
+            for payload in self.payloads
+            for resource in payload["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+
+@pytest.fixture
+def exporter(replay_app, monkeypatch):
+    """Route traces to memory instead of the configured exporter"""
+    capturing = CapturingExporter()
+    monkeypatch.setattr(tracer, "exporter", capturing)
+    monkeypatch.setattr(tracer, "enabled", True)
+    return capturing
+
+
+def test_batch_trace_covers_streamed_body(replay_app, articles, exporter):
+    """Test stage spans of a streamed batch land in the request's trace"""
+    batch = {"articles": [{"article_text": text, "title": title} for title, text in articles.items()]}
+    response = TestClient(replay_app.app).post("/evaluate/batch", json=batch, headers={"X-Request-ID": "batch-1"})
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "batch-1"
+
+    # One trace, exported after the body finished streaming
+    tracer.flush()
+    assert len(exporter.payloads) == 1
+    spans = exporter.spans()
+    root = next(span for span in spans if "parentSpanId" not in span)
+    print("Spans:", [span["name"] for span in spans])
+
+    assert root["name"] == "POST /evaluate/batch"
+    assert {"key": "http.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    assert {span["traceId"] for span in spans} == {root["traceId"]}
+    completions = [span for span in spans if span["name"] == "openai.chat_completion"]
+    assert len(completions) == len(articles)
+
+
+def test_evaluate_span_structure(replay_app, articles, exporter):
+    """Test a single evaluation produces the stage spans nested under the request"""
+    response = TestClient(replay_app.app).post(
+        "/evaluate", json={"article_text": articles["Climate Change"], "title": "Climate Change"}
+    )
+    assert response.status_code == 200
+    tracer.flush()
+
+    spans = {span["name"]: span for span in exporter.spans()}
+    print("Spans:", list(spans))
+    root = spans["POST /evaluate"]
+    evaluate = spans["evaluator.evaluate_article"]
+
+    assert "parentSpanId" not in root and root["kind"] == 2
+    assert spans["evaluate.validate"]["parentSpanId"] == root["spanId"]
+    assert evaluate["parentSpanId"] == root["spanId"]
+    for stage in ("evaluator.build_prompt", "openai.chat_completion", "evaluator.parse_response", "evaluator.score"):
+        assert spans[stage]["parentSpanId"] == evaluate["spanId"]
+        assert int(spans[stage]["startTimeUnixNano"]) <= int(spans[stage]["endTimeUnixNano"])
+    assert {"key": "request.id", "value": {"stringValue": response.headers["X-Request-ID"]}} in root["attributes"]
+
+
+def test_exporter_errors_do_not_fail_requests(replay_app, articles, monkeypatch):
+    """Test a broken exporter loses the trace but not the response"""
+    monkeypatch.setattr(tracer, "exporter", FailingExporter())
+    monkeypatch.setattr(tracer, "enabled", True)
+
+    response = TestClient(replay_app.app).post(
+        "/evaluate", json={"article_text": articles["Climate Change"], "title": "Climate Change"}
+    )
+    tracer.flush()
+    assert response.status_code == 200
+
+
+def test_admin_profiling_requires_token(replay_app, monkeypatch):
+    """Test profiling settings are refused without the configured admin token"""
+    client = TestClient(replay_app.app)
+
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": ""}).status_code == 403
+
+    monkeypatch.setenv("ADMIN_TOKEN", "secret-token")
+    assert client.get("/admin/profiling").status_code == 403
+    assert client.post(
+        "/admin/profiling", json={"enabled": True}, headers={"X-Admin-Token": "wrong-token"}
+    ).status_code == 403
+    assert client.get("/admin/profiling", headers={"X-Admin-Token": "secret-token"}).status_code == 200
+
+
+def test_live_evaluations_have_a_root_span(replay_app, articles, exporter, monkeypatch):
+    """Test WebSocket evaluations are traced under a span carrying the session id"""
+    import live
+
+    monkeypatch.setitem(live.config['live'], 'debounce_ms', 0)
+    with TestClient(replay_app.app).websocket_connect("/ws/evaluate") as ws:
+        ws.send_json({"article_text": articles["Climate Change"], "title": "Climate Change", "seq": 7})
+        assert ws.receive_json()["type"] == "result"
+    tracer.flush()
+
+    spans = {span["name"]: span for span in exporter.spans()}
+    root = spans["ws.evaluate"]
+    attributes = {attribute["key"]: attribute["value"] for attribute in root["attributes"]}
+    print("Live root span:", attributes)
+
+    assert len(exporter.payloads) == 1
+    assert "parentSpanId" not in root
+    assert attributes["live.seq"] == {"intValue": "7"}
+    assert "session.id" in attributes
+    assert spans["evaluator.evaluate_article"]["parentSpanId"] == root["spanId"]